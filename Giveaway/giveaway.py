@@ -1,141 +1,294 @@
 import asyncio
+import functools
 import json
+import os
 import time
-import uuid
 
 import disnake
 from disnake.ext import commands, tasks
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 
-class GiveawayBot(commands.InteractionBot):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+from metrics import metrics
+from participants import ParticipantSet, new_seed
+
+from .giveaway_store import GiveawayStore
+
+# Данные розыгрышей лежат рядом с модулем, как и до объединения ботов
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+GUILD_IDS = [409066217475670016]
+
+class GiveawayCog(commands.Cog):
+    EDIT_CONCURRENCY = 5  # Сколько сообщений розыгрышей редактируется одновременно
+    REFRESH_INTERVAL = 10  # Как часто (в секундах) обновляется счётчик участников
+
+    def __init__(self, bot):
+        self.bot = bot
         self.giveaways = []
-        self.check_giveaways.start()
+        self.giveaways_loaded = False
+        self.store = GiveawayStore(os.path.join(DATA_DIR, "giveaways.db"))
         self.update_giveaways.start()
 
+    def cog_unload(self):
+        self.update_giveaways.cancel()
+
+    @commands.Cog.listener()
     async def on_ready(self):
-        print(f'{self.user} has connected to Discord!')
         await self.load_giveaways()
 
-    @tasks.loop(minutes=1)  # Запуск каждую минуту для более частого обновления
+    @tasks.loop(seconds=REFRESH_INTERVAL)  # Одно объединённое редактирование за интервал
+    @metrics.instrument_loop("update_giveaways", REFRESH_INTERVAL)
     async def update_giveaways(self):
-        for giveaway in self.giveaways:
-            if not giveaway.ended and giveaway.message_id:
-                channel = self.get_channel(giveaway.announcement_channel_id)
-                if channel:
-                    try:
-                        message = await channel.fetch_message(giveaway.message_id)
-                        unix_timestamp = int(time.mktime(giveaway.end_time.timetuple()))
-                        formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
-                        new_embed = disnake.Embed(title=giveaway.name,
-                                                  description=f"Ends: {formatted_end_time}\nEntries: {len(giveaway.entries)}\nWinners: {giveaway.winners_count}",
-                                                  color=disnake.Color.blue())
-                        await message.edit(embed=new_embed)  # Обновление Embed с новым временем окончания
-                    except Exception as e:
-                        print(f"Error while updating giveaway: {e}")
+        # Редактируем только те сообщения, чей Embed действительно изменился
+        dirty = [giveaway for giveaway in self.giveaways
+                 if not giveaway.ended and giveaway.message_id and giveaway.needs_refresh()]
+        if dirty:
+            semaphore = asyncio.Semaphore(self.EDIT_CONCURRENCY)
+            await asyncio.gather(*[self.refresh_giveaway_message(giveaway, semaphore) for giveaway in dirty])
+
+    async def refresh_giveaway_message(self, giveaway, semaphore):
+        async with semaphore:
+            message = self.giveaway_message(giveaway)
+            if message is None:
+                return
+            count = len(giveaway.entries)
+            try:
+                await message.edit(embed=giveaway.build_embed())
+            except Exception as e:
+                print(f"Error while updating giveaway: {e}")
+                return
+            # Показанное число сохраняется, чтобы после перезапуска не редактировать сообщение повторно
+            giveaway.rendered_entries = count
+            await self.store.set_rendered_entries(giveaway.id, count)
+
+    def giveaway_message(self, giveaway):
+        # Для редактирования достаточно частичного сообщения, запрашивать его не нужно
+        if giveaway.message is None and giveaway.message_id:
+            channel = self.bot.get_channel(giveaway.announcement_channel_id)
+            if channel:
+                giveaway.message = channel.get_partial_message(giveaway.message_id)
+        return giveaway.message
 
     @update_giveaways.before_loop
     async def before_update_giveaways(self):
-        await self.wait_until_ready()
-
-    @tasks.loop(seconds=5)
-    async def check_giveaways(self):
-        current_time = datetime.now().replace(microsecond=0)
-        giveaways_to_remove = []
-        for giveaway in self.giveaways[:]:  # Итерация по копии списка для безопасного удаления
-            if current_time >= giveaway.end_time and not giveaway.ended:
-                giveaway.ended = True
-                winners = giveaway.pick_winners() if giveaway.entries else []
-
-                channel = self.get_channel(giveaway.announcement_channel_id)
-                if channel and giveaway.message_id:
-                    try:
-                        # Преобразование объекта datetime в Unix timestamp
-                        unix_timestamp = int(time.mktime(giveaway.end_time.timetuple()))
-                        # Форматирование времени окончания в формате Discord
-                        formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
-                        message = await channel.fetch_message(giveaway.message_id)
-                        winners_mentions = ', '.join([f'<@{winner_id}>' for winner_id in winners])
-                        new_embed = message.embeds[0]  # Копируем исходный Embed
-                        new_embed.description = f"Ended: {formatted_end_time}\nEntries: {len(giveaway.entries)}\nWinners: {winners_mentions}"
-                        await message.edit(embed=new_embed)  # Обновляем сообщение с новым Embed
-                    except Exception as e:
-                        print(f"Error fetching message: {e}")
+        await self.bot.wait_until_ready()
 
-                # Дополнительно, вы можете отправить отдельное сообщение с объявлением победителей
-                if winners:
-                    await channel.send(f"Поздравляем {winners_mentions}! Вы выйграли {giveaway.name}")
-                else:
-                    await channel.send(f"Розыгрыш '{giveaway.name}' завершен. Победителей нет.")
-
-                giveaways_to_remove.append(giveaway)
+    # Вызывается планировщиком в момент окончания розыгрыша
+    async def finish_giveaway(self, giveaway):
+        if giveaway.ended:
+            return
+        giveaway.ended = True
+        giveaway.stop_view()
+        winners = giveaway.pick_winners() if giveaway.entries else []
+        winners_mentions = ', '.join([f'<@{winner_id}>' for winner_id in winners])
+
+        channel = self.bot.get_channel(giveaway.announcement_channel_id)
+        if channel and giveaway.message_id:
+            try:
+                # Преобразование объекта datetime в Unix timestamp
+                unix_timestamp = int(time.mktime(giveaway.end_time.timetuple()))
+                # Форматирование времени окончания в формате Discord
+                formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
+                message = await channel.fetch_message(giveaway.message_id)
+                new_embed = message.embeds[0]  # Копируем исходный Embed
+                new_embed.description = f"Ended: {formatted_end_time}\nEntries: {len(giveaway.entries)}\nWinners: {winners_mentions}"
+                await message.edit(embed=new_embed, view=None)  # Обновляем сообщение с новым Embed и убираем кнопку
+            except Exception as e:
+                print(f"Error fetching message: {e}")
+
+        # Дополнительно, вы можете отправить отдельное сообщение с объявлением победителей
+        if channel:
+            if winners:
+                await channel.send(f"Поздравляем {winners_mentions}! Вы выйграли {giveaway.name}")
+            else:
+                await channel.send(f"Розыгрыш '{giveaway.name}' завершен. Победителей нет.")
 
-        # Удаляем завершенные розыгрыши из списка и сохраняем изменения в файл
-        for giveaway in giveaways_to_remove:
+        # Переносим завершенный розыгрыш в архив и удаляем из списка и из базы
+        if giveaway in self.giveaways:
             self.giveaways.remove(giveaway)
-        self.save_giveaways()
+        await self.archive_giveaway(giveaway, "finished", winners)
 
-    @check_giveaways.before_loop
-    async def before_check_giveaways(self):
-        await self.wait_until_ready()
+    async def archive_giveaway(self, giveaway, status, winners=()):
+        # Запись удаляется из базы только после успешной записи в архив. Иначе она
+        # остаётся с отметкой о завершении и при запуске не загружается
+        try:
+            await self.bot.archive.append("giveaway", giveaway.id, giveaway.name, status, giveaway.entries, winners,
+                                          channel_id=giveaway.announcement_channel_id)
+        except OSError as e:
+            print(f"Giveaway {giveaway.id} not archived: {e}")
+            await self.store.save_giveaway(giveaway)
+            return
+        await self.store.delete_giveaway(giveaway.id)
 
-    def get_next_giveaway_id(self):
-        last_id = max((giveaway.id for giveaway in self.giveaways), default=0)
-        return last_id + 1
+    def schedule_giveaway(self, giveaway):
+        self.bot.scheduler.schedule(("giveaway", giveaway.id), giveaway.end_time, functools.partial(self.finish_giveaway, giveaway))
 
-    def save_giveaways(self):
-        with open('giveaways.json', 'w') as file:
-            json.dump([giveaway.to_dict() for giveaway in self.giveaways], file)
+    async def get_next_giveaway_id(self):
+        # Пока отметки в базе нет, учитываются и ID розыгрышей, уже ушедших в архив
+        floor = 0
+        if not await self.store.has_giveaway_id_mark():
+            floor = await self.bot.archive.max_id("giveaway")
+        return await self.store.next_giveaway_id(floor)
 
     async def load_giveaways(self):
+        # on_ready срабатывает и после переподключения, загружаем розыгрыши только один раз
+        if self.giveaways_loaded:
+            return
+        self.giveaways_loaded = True
+        # View без ID сообщения срабатывает для кнопок, у сообщения которых нет своего View:
+        # завершённые, удалённые и потерянные розыгрыши
+        self.bot.add_view(GiveawayView(None, self.store))
+        if not await self.store.legacy_imported():
+            await self.import_giveaways_json()
+        giveaways_data = await self.store.load_all()
+        for data in giveaways_data:
+            giveaway = Giveaway.from_dict(data)
+            if giveaway.ended:
+                continue
+            self.giveaways.append(giveaway)
+            self.schedule_giveaway(giveaway)
+            self.recreate_giveaway_view(giveaway)
+
+    async def import_giveaways_json(self, path=os.path.join(DATA_DIR, 'giveaways.json')):
+        # Однократный перенос розыгрышей из старого JSON-файла в базу
         try:
-            with open('giveaways.json', 'r') as file:
+            with open(path, 'r') as file:
                 giveaways_data = json.load(file)
-                for data in giveaways_data:
-                    giveaway = Giveaway.from_dict(data)
-                    self.giveaways.append(giveaway)
-                    await self.recreate_giveaway_view(giveaway)
         except FileNotFoundError:
-            pass
+            giveaways_data = []
+        # Отметка о переносе пишется и при отсутствии файла, чтобы не проверять его при каждом запуске
+        await self.store.import_giveaways([Giveaway.from_dict(data) for data in giveaways_data])
 
-    async def recreate_giveaway_view(self, giveaway):
+    def recreate_giveaway_view(self, giveaway):
+        # Постоянный View привязывается к уже отправленному сообщению без его запроса и редактирования.
+        # Счётчик участников, если он устарел, поправит ближайший проход update_giveaways
         if giveaway.message_id:
-            channel = self.get_channel(giveaway.announcement_channel_id)
-            if channel:
-                try:
-                    message = await channel.fetch_message(giveaway.message_id)
-                    # Создаём новый GiveawayView и Embed
-                    embed = disnake.Embed(title=giveaway.name, description=f"Ends: {giveaway.formatted_end_time()}\nEntries: {len(giveaway.entries)}\nWinners: {giveaway.winners_count}", color=disnake.Color.blue())
-                    view = GiveawayView(giveaway, embed)
-                    await message.edit(embed=embed, view=view)  # Обновляем сообщение
-                except Exception as e:
-                    print(f"Error while recreating giveaway view: {e}")
+            giveaway.view = GiveawayView(giveaway, self.store)
+            self.bot.add_view(giveaway.view, message_id=giveaway.message_id)
+
+    @commands.slash_command(name="end_giveaway", description="Завершить розыгрыш и перенести его в архив", guild_ids=GUILD_IDS)
+    async def end_giveaway(self, inter, giveaway_id: str):
+        giveaway_to_end = next((giveaway for giveaway in self.giveaways if str(giveaway.id) == giveaway_id and not giveaway.ended), None)
+        if giveaway_to_end:
+            # Удаляем сообщение Discord
+            if giveaway_to_end.message_id:
+                channel = self.bot.get_channel(giveaway_to_end.announcement_channel_id)
+                if channel:
+                    try:
+                        message = await channel.fetch_message(giveaway_to_end.message_id)
+                        await message.delete()
+                    except Exception as e:
+                        await inter.response.send_message(f"Не удалось удалить сообщение: {e}", ephemeral=True)
+                        return
+                else:
+                    await inter.response.send_message("Не найден канал объявления.", ephemeral=True)
+                    return
+            else:
+                await inter.response.send_message("Message ID не найден.", ephemeral=True)
+                return
+
+            # Переносим розыгрыш в архив и удаляем из списка и из базы
+            self.giveaways.remove(giveaway_to_end)
+            self.bot.scheduler.cancel(("giveaway", giveaway_to_end.id))
+            giveaway_to_end.ended = True
+            giveaway_to_end.stop_view()
+            await self.archive_giveaway(giveaway_to_end, "cancelled")
+            await inter.response.send_message(f"Розыгрыш '{giveaway_to_end.name}' завершен и удален.", ephemeral=True)
+        else:
+            await inter.response.send_message(f"Розыгрыш с ID '{giveaway_id}' не найден.", ephemeral=True)
+
+    @commands.slash_command(name="start_giveaway", description="Начать розыгрыш", guild_ids=GUILD_IDS)
+    async def start_giveaway(self, inter, name: str, ends: str, winners: int):
+        # Преобразование строки с датой и временем в объект datetime
+        end_time = datetime.strptime(ends, "%d-%m-%Y %H:%M")
+
+        # Преобразование объекта datetime в Unix timestamp
+        unix_timestamp = int(time.mktime(end_time.timetuple()))
+
+        # Создание нового розыгрыша
+        new_id = await self.get_next_giveaway_id()
+        giveaway = Giveaway(new_id, name, ends, winners)
+
+        # Форматирование времени окончания в формате Discord
+        formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
+        embed = disnake.Embed(title=name, description=f"Ends: {formatted_end_time}\nEntries: 0\nWinners: {winners}", color=disnake.Color.blue())
+        giveaway.view = GiveawayView(giveaway, self.store)
+        file_path = os.path.join(DATA_DIR, "lineagechristmas.png")
+        file = disnake.File(file_path, filename="lineagechristmas.png")
+
+        # Запись в базе должна существовать до того, как кнопку можно будет нажать
+        self.giveaways.append(giveaway)
+        await self.store.save_giveaway(giveaway)
+        try:
+            await inter.response.send_message(
+                f'{inter.guild.default_role} \n 🇷🇺  Участвуйте в НОВОГОДНЕМ КОНКУРСЕ от РПГ-Клуба! ☃️ \n Стань автором самой красивой елочной игрушки и получи подарок! 🎄 \n\n 🇬🇧  Participate in RPG Club\'s NEW YEAR\'S CONTEST! ☃️ \n Become the author of the most beautiful Christmas tree toy and get a gift! 🎄\n https://forum.rpg-club.org/threads/new-year-contest-2024-novogodnij-konkurs-2024.135992/ ',
+                file=file,
+                embed=embed,
+                view=giveaway.view
+            )
+            message = await inter.original_response()
+        except disnake.HTTPException:
+            print("Не удалось отправить сообщение или получить его ID")
+            giveaway.stop_view()
+            self.giveaways.remove(giveaway)
+            await self.store.delete_giveaway(giveaway.id)
+            raise
+
+        giveaway.set_message_id(message.id)  # Сохраняем ID сообщения
+        giveaway.message = message
+        giveaway.rendered_entries = 0
+        self.schedule_giveaway(giveaway)
+        await self.store.save_giveaway(giveaway)
+
+    @end_giveaway.autocomplete("giveaway_id")
+    async def giveaway_id_autocomplete(self, inter: disnake.ApplicationCommandInteraction, user_input: str):
+        active_giveaways = [str(giveaway.id) for giveaway in self.giveaways if not giveaway.ended]
+        return [giveaway_id for giveaway_id in active_giveaways if user_input in giveaway_id]
+
 
 class Giveaway:
     def __init__(self, id, name, end_time_str, winners_count):
         self.id = id
         self.name = name
         self.end_time = datetime.strptime(end_time_str, "%d-%m-%Y %H:%M")  # Преобразование строки в datetime
-        self.entries = set()
+        self.entries = ParticipantSet()
         self.winners_count = winners_count
         self.ended = False
         self.announcement_channel_id = 742147410834489455
         self.message_id = None
+        self.message = None  # Закэшированный объект сообщения с объявлением
+        self.rendered_entries = None  # Число участников, которое сейчас показано в сообщении
+        self.view = None  # Постоянный View с кнопкой участия
 
     def formatted_end_time(self):
         unix_timestamp = int(time.mktime(self.end_time.timetuple()))
         return f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
 
+    def render_description(self):
+        return f"Ends: {self.formatted_end_time()}\nEntries: {len(self.entries)}\nWinners: {self.winners_count}"
+
+    def build_embed(self):
+        return disnake.Embed(title=self.name, description=self.render_description(), color=disnake.Color.blue())
+
+    def needs_refresh(self):
+        return len(self.entries) != self.rendered_entries
+
     def add_entry(self, user_id):
         self.entries.add(user_id)
 
+    def stop_view(self):
+        if self.view is not None:
+            self.view.stop()
+            self.view = None
+
     def set_message_id(self, message_id):
         self.message_id = message_id
 
-    def pick_winners(self):
-        return random.sample(list(self.entries), min(self.winners_count, len(self.entries)))
+    def pick_winners(self, seed=None):
+        # Сид выводится в лог, чтобы результат можно было проверить по списку участников
+        if seed is None:
+            seed = new_seed()
+        print(f"Giveaway {self.id}: winners drawn with seed {seed}")
+        return self.entries.draw(self.winners_count, seed)
 
     def to_dict(self):
         return {
@@ -146,101 +299,43 @@ class Giveaway:
             "winners_count": self.winners_count,
             "ended": self.ended,
             "announcement_channel_id": self.announcement_channel_id,
-            "message_id": self.message_id
+            "message_id": self.message_id,
+            "rendered_entries": self.rendered_entries
         }
 
     @staticmethod
     def from_dict(data):
         giveaway = Giveaway(data['id'], data['name'], data['end_time'], data['winners_count'])
-        giveaway.entries = set(data['entries'])
+        giveaway.entries = ParticipantSet(data['entries'])
         giveaway.ended = data['ended']
         giveaway.announcement_channel_id = data['announcement_channel_id']
         giveaway.message_id = data['message_id']
+        giveaway.rendered_entries = data.get('rendered_entries')
         return giveaway
 
-bot = GiveawayBot(test_guilds=[409066217475670016], allowed_mentions= disnake.AllowedMentions(everyone = True))
-
-async def giveaway_id_autocomplete(inter: disnake.ApplicationCommandInteraction, user_input: str):
-    active_giveaways = [str(giveaway.id) for giveaway in bot.giveaways if not giveaway.ended]
-    return [giveaway_id for giveaway_id in active_giveaways if user_input in giveaway_id]
-
-@bot.slash_command(name="end_giveaway", description="Завершить розыгрыш и удалить его из базы данных")
-async def end_giveaway(inter, giveaway_id: str = commands.Param(autocomplete=giveaway_id_autocomplete)):
-    giveaway_to_end = next((giveaway for giveaway in bot.giveaways if str(giveaway.id) == giveaway_id and not giveaway.ended), None)
-    if giveaway_to_end:
-        # Удаляем сообщение Discord
-        if giveaway_to_end.message_id:
-            channel = bot.get_channel(giveaway_to_end.announcement_channel_id)
-            if channel:
-                try:
-                    message = await channel.fetch_message(giveaway_to_end.message_id)
-                    await message.delete()
-                except Exception as e:
-                    await inter.response.send_message(f"Не удалось удалить сообщение: {e}", ephemeral=True)
-                    return
-            else:
-                await inter.response.send_message("Не найден канал объявления.", ephemeral=True)
-                return
-        else:
-            await inter.response.send_message("Message ID не найден.", ephemeral=True)
-            return
-
-        # Удаляем розыгрыш из списка и файла JSON
-        bot.giveaways.remove(giveaway_to_end)
-        bot.save_giveaways()
-        await inter.response.send_message(f"Розыгрыш '{giveaway_to_end.name}' завершен и удален.", ephemeral=True)
-    else:
-        await inter.response.send_message(f"Розыгрыш с ID '{giveaway_id}' не найден.", ephemeral=True)
-
-@bot.slash_command(name="start_giveaway", description="Начать розыгрыш")
-async def start_giveaway(inter, name: str, ends: str, winners: int):
-    # Преобразование строки с датой и временем в объект datetime
-    end_time = datetime.strptime(ends, "%d-%m-%Y %H:%M")
-
-    # Преобразование объекта datetime в Unix timestamp
-    unix_timestamp = int(time.mktime(end_time.timetuple()))
-
-    # Создание нового розыгрыша
-    new_id = bot.get_next_giveaway_id()
-    giveaway = Giveaway(new_id, name, ends, winners)
-
-    # Форматирование времени окончания в формате Discord
-    formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
-    embed = disnake.Embed(title=name, description=f"Ends: {formatted_end_time}\nEntries: 0\nWinners: {winners}", color=disnake.Color.blue())
-    view = GiveawayView(giveaway, embed)
-    file_path = "lineagechristmas.png"
-    file = disnake.File(file_path, filename="lineagechristmas.png")
-
-    await inter.response.send_message(
-        f'{inter.guild.default_role} \n 🇷🇺  Участвуйте в НОВОГОДНЕМ КОНКУРСЕ от РПГ-Клуба! ☃️ \n Стань автором самой красивой елочной игрушки и получи подарок! 🎄 \n\n 🇬🇧  Participate in RPG Club\'s NEW YEAR\'S CONTEST! ☃️ \n Become the author of the most beautiful Christmas tree toy and get a gift! 🎄\n https://forum.rpg-club.org/threads/new-year-contest-2024-novogodnij-konkurs-2024.135992/ ',
-        file=file,
-        embed=embed,
-        view=view
-    )
-    message = await inter.original_response()
-
-    if message:
-        giveaway.set_message_id(message.id)  # Сохраняем ID сообщения
-        bot.giveaways.append(giveaway)
-        bot.save_giveaways()
-    else:
-        print("Не удалось отправить сообщение или получить его ID")
-
 class GiveawayView(disnake.ui.View):
-    def __init__(self, giveaway, embed):
+    def __init__(self, giveaway, store):
         super().__init__(timeout=None)
         self.giveaway = giveaway
-        self.embed = embed
+        self.store = store
 
     @disnake.ui.button(style=disnake.ButtonStyle.primary, emoji="🎉", custom_id="join_giveaway")
+    @metrics.instrument("join_giveaway")
     async def join_button(self, button: disnake.ui.Button, interaction: disnake.MessageInteraction):
-        # Преобразование объекта datetime в Unix timestamp
-        unix_timestamp = int(time.mktime(self.giveaway.end_time.timetuple()))
-        # Форматирование времени окончания в формате Discord
-        formatted_end_time = f"<t:{unix_timestamp}:R> (<t:{unix_timestamp}:D>)"
+        # Кнопка могла остаться на сообщении уже завершённого или неизвестного розыгрыша
+        if self.giveaway is None or self.giveaway.ended:
+            await interaction.response.send_message("Розыгрыш завершён.", ephemeral=True)
+            return
+
+        # Повторное нажатие не меняет ни участников, ни сообщение
+        if interaction.user.id in self.giveaway.entries:
+            await interaction.response.send_message("Вы уже участвуете в розыгрыше!", ephemeral=True)
+            return
+
+        # Счётчик участников в сообщении обновит update_giveaways, здесь только один ответ
         self.giveaway.add_entry(interaction.user.id)
-        self.embed.description = f"Ends: {formatted_end_time}\nEntries: {len(self.giveaway.entries)}\nWinners: {self.giveaway.winners_count}"
-        await interaction.response.edit_message(embed=self.embed)
-        await interaction.followup.send(f"{interaction.user.mention} присоединился к розыгрышу!", ephemeral=True)
+        await interaction.response.send_message(f"{interaction.user.mention} присоединился к розыгрышу!", ephemeral=True)
+        await self.store.add_entry(self.giveaway.id, interaction.user.id)
 
-bot.run('MTE4MDEwODMxMTAzNTY1ODI2MA.GLH4d2.9Af5SmZi9R5WTJAi-dVC_LZuhMQaceNVQdQkFI')
\ No newline at end of file
+def setup(bot):
+    bot.add_cog(GiveawayCog(bot))
\ No newline at end of file
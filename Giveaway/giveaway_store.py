@@ -0,0 +1,170 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS giveaways (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    winners_count INTEGER NOT NULL,
+    ended INTEGER NOT NULL DEFAULT 0,
+    announcement_channel_id INTEGER NOT NULL,
+    message_id INTEGER,
+    rendered_entries INTEGER
+);
+CREATE TABLE IF NOT EXISTS entries (
+    giveaway_id INTEGER NOT NULL REFERENCES giveaways(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (giveaway_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+LEGACY_IMPORTED = "legacy_json_imported"
+LAST_GIVEAWAY_ID = "last_giveaway_id"
+
+
+class GiveawayStore:
+    # Хранилище розыгрышей в SQLite (WAL). Все запросы выполняются в одном
+    # отдельном потоке, чтобы не блокировать цикл событий
+    def __init__(self, path="giveaways.db"):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="giveaway-store")
+        self._conn = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            # Базы, созданные до появления столбца с показанным числом участников
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(giveaways)")]
+            if "rendered_entries" not in columns:
+                self._conn.execute("ALTER TABLE giveaways ADD COLUMN rendered_entries INTEGER")
+        return self._conn
+
+    async def load_all(self):
+        return await self._run(self._load_all)
+
+    async def import_giveaways(self, giveaways):
+        await self._run(self._import_giveaways, [self._row(giveaway) for giveaway in giveaways],
+                        [(giveaway.id, user_id) for giveaway in giveaways for user_id in giveaway.entries])
+
+    async def legacy_imported(self):
+        return await self._run(self._legacy_imported)
+
+    async def has_giveaway_id_mark(self):
+        return await self._run(self._has_giveaway_id_mark)
+
+    async def next_giveaway_id(self, floor=0):
+        return await self._run(self._next_giveaway_id, floor)
+
+    async def save_giveaway(self, giveaway):
+        await self._run(self._save_giveaway, self._row(giveaway))
+
+    async def add_entry(self, giveaway_id, user_id):
+        await self._run(self._add_entry, giveaway_id, user_id)
+
+    async def set_rendered_entries(self, giveaway_id, count):
+        await self._run(self._set_rendered_entries, giveaway_id, count)
+
+    async def delete_giveaway(self, giveaway_id):
+        await self._run(self._delete_giveaway, giveaway_id)
+
+    @staticmethod
+    def _row(giveaway):
+        return (giveaway.id, giveaway.name, giveaway.end_time.strftime("%d-%m-%Y %H:%M"), giveaway.winners_count,
+                int(giveaway.ended), giveaway.announcement_channel_id, giveaway.message_id, giveaway.rendered_entries)
+
+    def _load_all(self):
+        conn = self._connection()
+        # Формат совпадает с Giveaway.to_dict, чтобы использовать Giveaway.from_dict
+        giveaways = {}
+        for row in conn.execute("SELECT id, name, end_time, winners_count, ended, announcement_channel_id, message_id, rendered_entries FROM giveaways ORDER BY id"):
+            giveaways[row[0]] = {
+                "id": row[0],
+                "name": row[1],
+                "end_time": row[2],
+                "entries": [],
+                "winners_count": row[3],
+                "ended": bool(row[4]),
+                "announcement_channel_id": row[5],
+                "message_id": row[6],
+                "rendered_entries": row[7]
+            }
+        for giveaway_id, user_id in conn.execute("SELECT giveaway_id, user_id FROM entries"):
+            if giveaway_id in giveaways:
+                giveaways[giveaway_id]["entries"].append(user_id)
+        return list(giveaways.values())
+
+    def _import_giveaways(self, rows, entries):
+        conn = self._connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO giveaways VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR IGNORE INTO entries (giveaway_id, user_id) VALUES (?, ?)", entries)
+            # Отметка в той же транзакции: перенос выполняется ровно один раз
+            conn.execute("INSERT OR REPLACE INTO meta VALUES (?, '1')", (LEGACY_IMPORTED,))
+
+    def _legacy_imported(self):
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (LEGACY_IMPORTED,)).fetchone():
+            return True
+        # Базы, созданные до появления отметки: непустая база значит, что перенос уже был
+        if conn.execute("SELECT 1 FROM giveaways LIMIT 1").fetchone():
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, '1')", (LEGACY_IMPORTED,))
+            return True
+        return False
+
+    def _has_giveaway_id_mark(self):
+        return self._connection().execute("SELECT 1 FROM meta WHERE key = ?", (LAST_GIVEAWAY_ID,)).fetchone() is not None
+
+    def _next_giveaway_id(self, floor):
+        # ID выдаются по сохранённой отметке и никогда не повторяются, даже после
+        # удаления розыгрыша из базы (он мог уйти в архив под этим ID)
+        conn = self._connection()
+        with conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (LAST_GIVEAWAY_ID,)).fetchone()
+            max_id = conn.execute("SELECT MAX(id) FROM giveaways").fetchone()[0]
+            giveaway_id = max(int(row[0]) if row else 0, max_id or 0, floor) + 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (LAST_GIVEAWAY_ID, str(giveaway_id)))
+        return giveaway_id
+
+    def _save_giveaway(self, row):
+        conn = self._connection()
+        with conn:
+            conn.execute("""
+                INSERT INTO giveaways VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    end_time = excluded.end_time,
+                    winners_count = excluded.winners_count,
+                    ended = excluded.ended,
+                    announcement_channel_id = excluded.announcement_channel_id,
+                    message_id = excluded.message_id,
+                    rendered_entries = excluded.rendered_entries
+            """, row)
+
+    def _add_entry(self, giveaway_id, user_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO entries (giveaway_id, user_id) VALUES (?, ?)", (giveaway_id, user_id))
+
+    def _set_rendered_entries(self, giveaway_id, count):
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE giveaways SET rendered_entries = ? WHERE id = ?", (count, giveaway_id))
+
+    def _delete_giveaway(self, giveaway_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM giveaways WHERE id = ?", (giveaway_id,))
@@ -0,0 +1,132 @@
+import asyncio
+import base64
+import gzip
+import json
+import os
+import sys
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class EventArchive:
+    # Холодное хранилище завершённых событий (розыгрыши и боссы): gzip-файл, в который
+    # каждое событие дописывается отдельным сжатым блоком с одной JSON-строкой.
+    # Файл только растёт, чтение идёт потоком по одной записи и целиком в память не загружается
+    READ_CHUNK = 1 << 16
+
+    def __init__(self, path="events_archive.jsonl.gz"):
+        self.path = path
+        self._checked = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-archive")
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def append(self, kind, event_id, name, status, participants, winners, **extra):
+        record = {
+            "kind": kind,
+            "id": event_id,
+            "name": name,
+            "status": status,
+            "ended_at": datetime.now().isoformat(timespec="seconds"),
+            "entries_count": len(participants),
+            "entries": base64.b64encode(participants.to_bytes()).decode(),
+            "winners": list(winners),
+            **extra
+        }
+        await self._run(self._append, json.dumps(record, ensure_ascii=False))
+
+    async def history(self, page=1, per_page=10, kind=None):
+        # Страница в порядке от новых к старым и общее число событий
+        return await self._run(self._history, page, per_page, kind)
+
+    async def max_id(self, kind):
+        return await self._run(self._max_id, kind)
+
+    async def participation(self, user_id):
+        return await self._run(self._participation, user_id)
+
+    def _append(self, line):
+        if not self._checked:
+            self._truncate_torn_tail()
+            self._checked = True
+        # Блок сжимается целиком и дописывается одной записью; при чтении блоки склеиваются в один поток
+        data = gzip.compress(line.encode() + b"\n")
+        with open(self.path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _truncate_torn_tail(self):
+        # Последний блок мог остаться недописанным при падении. Новые блоки после него
+        # не прочитались бы, поэтому файл обрезается до конца последнего целого блока
+        if not os.path.exists(self.path):
+            return
+        valid_size = self._valid_size()
+        if valid_size != os.path.getsize(self.path):
+            print(f"Archive {self.path}: torn tail cut at {valid_size} bytes")
+            os.truncate(self.path, valid_size)
+
+    def _valid_size(self):
+        # Блоки проверяются по одному (включая CRC), распакованные данные не сохраняются
+        valid_size = offset = 0
+        decompressor = zlib.decompressobj(wbits=31)
+        with open(self.path, "rb") as file:
+            while chunk := file.read(self.READ_CHUNK):
+                while chunk:
+                    try:
+                        decompressor.decompress(chunk)
+                    except zlib.error:
+                        return valid_size
+                    if not decompressor.eof:
+                        offset += len(chunk)
+                        break
+                    offset += len(chunk) - len(decompressor.unused_data)
+                    valid_size = offset
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(wbits=31)
+        return valid_size
+
+    def _records(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+            # Последний блок мог остаться недописанным при падении
+            print(f"Archive {self.path} is truncated: {e}")
+
+    def _history(self, page, per_page, kind):
+        # В памяти держатся только записи до конца запрошенной страницы, без списков участников
+        window = deque(maxlen=page * per_page)
+        total = 0
+        for record in self._records():
+            if kind is not None and record["kind"] != kind:
+                continue
+            record.pop("entries", None)
+            window.append(record)
+            total += 1
+        newest = list(reversed(window))
+        return newest[(page - 1) * per_page:page * per_page], total
+
+    def _max_id(self, kind):
+        return max((record["id"] for record in self._records() if record["kind"] == kind), default=0)
+
+    def _participation(self, user_id):
+        stats = {"events": 0, "wins": 0, "giveaway": 0, "boss": 0}
+        for record in self._records():
+            entries = array("Q")
+            entries.frombytes(base64.b64decode(record["entries"]))
+            if sys.byteorder != "little":
+                entries.byteswap()
+            if user_id in entries:
+                stats["events"] += 1
+                stats[record["kind"]] = stats.get(record["kind"], 0) + 1
+            if user_id in record["winners"]:
+                stats["wins"] += 1
+        return stats
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boss_store import BossJournal
+
+HITS = 500
+SNAPSHOT_EVERY = 250
+
+
+# Прежний способ: полная перезапись файла при каждом ударе
+def legacy_save(path, hp, users):
+    data = {"hp": hp, "users_who_reacted": list(users), "end_date": None, "event_ended": False, "message_id": None}
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+
+def bench_legacy(directory, participants):
+    path = os.path.join(directory, "legacy.json")
+    users = set(range(10 ** 17, 10 ** 17 + participants))
+    start = time.perf_counter()
+    for i in range(HITS):
+        users.add(i)
+        legacy_save(path, 1500, users)
+    return time.perf_counter() - start, time.perf_counter() - start
+
+
+def bench_journal(directory, participants):
+    journal = BossJournal(os.path.join(directory, "state.json"), os.path.join(directory, "state.journal"))
+    users = set(range(10 ** 17, 10 ** 17 + participants))
+    start = time.perf_counter()
+    for i in range(HITS):
+        users.add(i)
+        journal.append_hit(i)
+        if (i + 1) % SNAPSHOT_EVERY == 0:
+            journal.write_snapshot({"hp": 1500, "users_who_reacted": list(users)})
+    # Время, проведённое в цикле событий, и время до окончания всех записей
+    on_loop = time.perf_counter() - start
+    journal.close()
+    return on_loop, time.perf_counter() - start
+
+
+def main():
+    print(f"{'participants':>12} {'approach':>8} {'loop ms/hit':>12} {'total ms/hit':>13}")
+    for participants in (10_000, 50_000, 100_000):
+        for name, bench in (("legacy", bench_legacy), ("journal", bench_journal)):
+            with tempfile.TemporaryDirectory() as directory:
+                on_loop, total = bench(directory, participants)
+            print(f"{participants:>12} {name:>8} {on_loop / HITS * 1000:>12.3f} {total / HITS * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CLICKS_PER_MINUTE = 6000
+MINUTES = 2
+UNIQUE_USERS = 8000
+
+
+class RestCounter:
+    def __init__(self):
+        self.calls = 0
+
+    async def call(self, *args, **kwargs):
+        self.calls += 1
+
+
+class FakeResponse:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def send_message(self, *args, **kwargs):
+        await self.rest.call()
+
+    async def edit_message(self, *args, **kwargs):
+        await self.rest.call()
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+
+
+class FakeInteraction:
+    def __init__(self, bot, rest, user_id):
+        self.bot = bot
+        self.user = FakeUser(user_id)
+        self.response = FakeResponse(rest)
+
+
+class FakeMessage:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def edit(self, *args, **kwargs):
+        await self.rest.call()
+
+
+async def main():
+    import main
+    from Giveaway import giveaway as module
+
+    rest = RestCounter()
+    bot = main.create_bot(["giveaway"])
+    cog = bot.get_cog("GiveawayCog")
+    cog.update_giveaways.cancel()
+    with tempfile.TemporaryDirectory() as directory:
+        cog.store = module.GiveawayStore(os.path.join(directory, "giveaways.db"))
+        giveaway = module.Giveaway(1, "bench", "01-01-2099 00:00", 10)
+        giveaway.message_id = 1
+        giveaway.message = FakeMessage(rest)
+        cog.giveaways.append(giveaway)
+        await cog.store.save_giveaway(giveaway)
+        view = module.GiveawayView(giveaway, cog.store)
+
+        clicks = CLICKS_PER_MINUTE * MINUTES
+        ticks = MINUTES * 60 // cog.REFRESH_INTERVAL
+        clicks_per_tick = clicks // ticks
+        rng = random.Random(0)
+        latencies = []
+        for _ in range(ticks):
+            for _ in range(clicks_per_tick):
+                interaction = FakeInteraction(bot, rest, rng.randrange(1, UNIQUE_USERS + 1))
+                start = time.perf_counter()
+                await view.join_button.callback(interaction)
+                latencies.append(time.perf_counter() - start)
+            # Один проход цикла обновления за интервал
+            await cog.update_giveaways()
+
+    latencies.sort()
+    joins = len(giveaway.entries)
+    print(f"clicks: {clicks}, unique joins: {joins}")
+    print(f"REST calls: {rest.calls} ({rest.calls / clicks:.3f} per click, {rest.calls / joins:.3f} per join)")
+    print(f"previous pipeline: {2 * clicks} REST calls (2.000 per click)")
+    print(f"handler p50: {latencies[len(latencies) // 2] * 1000:.3f} ms, p99: {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бот без подключения к шлюзу получает синтетические события большой гильдии в том объёме,
+# который Discord прислал бы при данных намерениях: участники и присутствие только с
+# members/presences, сообщения только с guild_messages, сырые реакции в обоих режимах
+CHILD = """
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+GUILD_ID = 200
+MEMBERS, MESSAGES, REACTIONS, CHANNELS = {members}, {messages}, {reactions}, {channels}
+
+def user(user_id):
+    return {{"id": str(user_id), "username": f"user{{user_id}}", "discriminator": "0", "avatar": None, "global_name": None}}
+
+def guild_payload(intents):
+    members = range(10, 10 + MEMBERS) if intents.members else ()
+    online = range(10, 10 + MEMBERS // 3) if intents.presences else ()
+    return {{
+        "id": str(GUILD_ID), "name": "bench", "owner_id": "10", "large": True, "member_count": MEMBERS,
+        "features": [], "emojis": [], "stickers": [], "voice_states": [], "threads": [],
+        "roles": [{{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                    "colors": {{"primary_color": 0, "secondary_color": None, "tertiary_color": None}},
+                    "hoist": False, "managed": False, "mentionable": False}}],
+        "channels": [{{"id": str(1000 + index), "type": 0, "name": f"channel{{index}}", "position": index,
+                       "permission_overwrites": []}} for index in range(CHANNELS)],
+        "members": [{{"user": user(user_id), "roles": [], "joined_at": "2020-01-01T00:00:00+00:00",
+                      "deaf": False, "mute": False}} for user_id in members],
+        "presences": [{{"user": {{"id": str(user_id)}}, "status": "online", "activities": [],
+                        "client_status": {{"desktop": "online"}}}} for user_id in online],
+    }}
+
+def message_payload(index):
+    return {{"id": str(10 ** 6 + index), "channel_id": str(1000 + index % CHANNELS), "guild_id": str(GUILD_ID),
+             "author": user(10 + index % max(MEMBERS, 1)), "content": "hello " * 10,
+             "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None, "tts": False,
+             "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [], "embeds": [],
+             "pinned": False, "type": 0}}
+
+def reaction_payload(index):
+    user_id = 10 + index % max(MEMBERS, 1)
+    return {{"user_id": str(user_id), "channel_id": "1000", "message_id": "1", "guild_id": str(GUILD_ID),
+             "emoji": {{"id": None, "name": "⚔️"}}, "type": 0,
+             "member": {{"user": user(user_id), "roles": [], "joined_at": "2020-01-01T00:00:00+00:00",
+                         "deaf": False, "mute": False}}}}
+
+async def main():
+    import main
+    bot = main.create_bot({extensions!r}, lean={lean!r})
+    created = time.perf_counter()
+    state = bot._connection
+    intents = bot.intents
+    guild = state._add_guild_from_data(guild_payload(intents))
+    if intents.guild_messages:
+        for index in range(MESSAGES):
+            state.parse_message_create(message_payload(index))
+    if intents.guild_reactions:
+        for index in range(REACTIONS):
+            state.parse_message_reaction_add(reaction_payload(index))
+    await asyncio.sleep(0)
+    return {{"startup": created - started, "ingest": time.perf_counter() - created,
+             "members": len(guild._members), "messages": len(state._messages or ())}}
+
+result = asyncio.run(main())
+result["rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps(result))
+"""
+
+
+def run(args, lean):
+    child = CHILD.format(root=ROOT, extensions=["boss", "giveaway"], lean=lean, members=args.members,
+                         messages=args.messages, reactions=args.reactions, channels=args.channels)
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.run([sys.executable, "-c", child], cwd=directory, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память и время запуска: Intents.all() против экономного режима")
+    parser.add_argument("--members", type=int, default=50000)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--reactions", type=int, default=5000)
+    parser.add_argument("--channels", type=int, default=100)
+    args = parser.parse_args()
+
+    full = run(args, False)
+    lean = run(args, True)
+    print(f"{'mode':>12} {'startup s':>10} {'ingest s':>9} {'RSS MiB':>9} {'members':>8} {'messages':>9}")
+    for name, result in (("Intents.all", full), ("lean", lean)):
+        print(f"{name:>12} {result['startup']:>10.2f} {result['ingest']:>9.2f} {result['rss_kb'] / 1024:>9.1f} "
+              f"{result['members']:>8} {result['messages']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from participants import ParticipantSet
+
+ENTRIES = 1_000_000
+LOOKUPS = 100_000
+WINNERS = 10
+
+
+def snowflakes(count):
+    rng = random.Random(0)
+    # Реалистичные snowflake: время в старших битах, счётчик в младших
+    return ((rng.randrange(1 << 40) << 22) | rng.randrange(1 << 22) for _ in range(count))
+
+
+def measure(name, build, draw):
+    # Память считается вместе с объектами int, которые set хранит сам
+    tracemalloc.start()
+    container = build(snowflakes(ENTRIES))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+
+    ids = list(snowflakes(ENTRIES))
+    start = time.perf_counter()
+    container = build(ids)
+    build_time = time.perf_counter() - start
+
+    probes = ids[:LOOKUPS // 2] + [user_id + 1 for user_id in ids[:LOOKUPS // 2]]
+    start = time.perf_counter()
+    for user_id in probes:
+        user_id in container
+    lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    draw(container)
+    draw_time = time.perf_counter() - start
+
+    print(f"{name:>14} {memory / ENTRIES:>10.1f} {build_time:>9.2f} {lookup_time / LOOKUPS * 1e9:>12.0f} {draw_time * 1000:>10.3f}")
+
+
+async def damage_latency(participants, ids):
+    # Горячий путь целиком: Boss.damage с записью в журнал, для повторных и новых ударов
+    import main
+    bot = main.create_bot(["boss"])
+    registry = bot.get_cog("BossCog").registry
+    boss = registry.create(1, 1)
+    boss.users_who_reacted = participants
+    boss.end_date = datetime.now() + timedelta(days=1)
+    boss.hp = 1 << 62
+    boss.SNAPSHOT_EVERY = float("inf")
+    result = []
+    for probes in (ids[:LOOKUPS], [user_id + 1 for user_id in ids[:LOOKUPS]]):
+        start = time.perf_counter()
+        for user_id in probes:
+            boss.damage(user_id)
+        result.append((time.perf_counter() - start) / len(probes) * 1e9)
+    boss.journal.flush()
+    return result
+
+
+def hot_path():
+    ids = list(snowflakes(ENTRIES))
+    print(f"{'Boss.damage':>14} {'repeat ns':>10} {'new hit ns':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for name, build in (("set", set), ("ParticipantSet", ParticipantSet)):
+            repeat, new = asyncio.run(damage_latency(build(ids), ids))
+            print(f"{name:>14} {repeat:>10.0f} {new:>11.0f}")
+
+
+def main():
+    print(f"{'container':>14} {'bytes/id':>10} {'build s':>9} {'lookup ns':>12} {'draw ms':>10}")
+    # Текущий подход: set и random.sample по копии в список, как в Giveaway.pick_winners
+    measure("set", set, lambda entries: random.sample(list(entries), WINNERS))
+    measure("ParticipantSet", ParticipantSet, lambda entries: entries.draw(WINNERS, 0))
+    participants = ParticipantSet(snowflakes(ENTRIES))
+    start = time.perf_counter()
+    data = participants.to_bytes()
+    ParticipantSet.from_bytes(data)
+    print(f"serialised: {len(data) / ENTRIES:.1f} bytes/id, round trip {time.perf_counter() - start:.2f} s")
+    hot_path()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Прежние точки входа: отдельный бот босса и отдельный бот розыгрышей
+BASELINE_FILES = ["main.py", "Giveaway/giveaway.py"]
+
+# Запуск бота без подключения к шлюзу: импорт, создание клиента, загрузка расширений
+CHILD = """
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+
+async def main():
+    import main
+    main.create_bot({extensions!r})
+
+asyncio.run(main())
+print(json.dumps({{"startup": time.perf_counter() - started,
+                  "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+# Прежний файл бота выполняется целиком, bot.run в конце модуля подменяется пустой функцией
+BASELINE_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import disnake
+disnake.Client.run = lambda self, *args, **kwargs: None
+with open({path!r}) as file:
+    source = file.read()
+exec(compile(source, {path!r}, "exec"), {{"__name__": "__main__"}})
+print(json.dumps({{"startup": time.perf_counter() - started,
+                  "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def measure(child, directory):
+    output = subprocess.run([sys.executable, "-c", child], cwd=directory, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(extensions):
+    with tempfile.TemporaryDirectory() as directory:
+        return measure(CHILD.format(root=ROOT, extensions=extensions), directory)
+
+
+def run_baseline(revision, path):
+    # Исходник прежней версии берётся из истории git, состояние пишется во временный каталог
+    source = subprocess.run(["git", "show", f"{revision}:{path}"], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, os.path.basename(path))
+        with open(script, "w") as file:
+            file.write(source)
+        return measure(BASELINE_CHILD.format(path=script), directory)
+
+
+def main():
+    # По умолчанию прежняя схема - первый коммит репозитория
+    revision = sys.argv[1] if len(sys.argv) > 1 else subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()[0]
+    baseline = [run_baseline(revision, path) for path in BASELINE_FILES]
+    merged = run(["boss", "giveaway"])
+    print(f"{'setup':>28} {'startup s':>10} {'RSS MiB':>9}")
+    print(f"{'baseline: two bots @' + revision[:7]:>28} {sum(result['startup'] for result in baseline):>10.2f} "
+          f"{sum(result['rss_kb'] for result in baseline) / 1024:>9.1f}")
+    print(f"{'current: one process':>28} {merged['startup']:>10.2f} {merged['rss_kb'] / 1024:>9.1f}")
+    print("Кэш гильдий и второе подключение к шлюзу в прежней схеме здесь не учитываются: прогон идёт без сети")
+
+
+if __name__ == "__main__":
+    main()
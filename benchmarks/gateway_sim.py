@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import disnake
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BOT_USER_ID = 1
+CHANNEL_ID = 100
+GUILD_ID = 200
+BOSS_MESSAGE_ID = 300
+GIVEAWAY_MESSAGE_ID = 400
+
+
+class RestRecorder:
+    # Заменяет REST-слой Discord: считает вызовы по типу и имитирует задержку ответа
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def call(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def total(self):
+        return sum(self.calls.values())
+
+
+class FakeMessage:
+    def __init__(self, rest, message_id):
+        self.rest = rest
+        self.id = message_id
+        self.embeds = []
+
+    async def edit(self, **kwargs):
+        await self.rest.call("message.edit")
+
+
+class FakeChannel:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def send(self, *args, **kwargs):
+        await self.rest.call("channel.send")
+
+
+class FakeUser:
+    def __init__(self, rest, user_id):
+        self.rest = rest
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+        self.dm_channel = None
+
+    async def create_dm(self):
+        await self.rest.call("user.create_dm")
+        return FakeChannel(self.rest)
+
+
+class FakeResponse:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def send_message(self, *args, **kwargs):
+        await self.rest.call("interaction.send_message")
+
+    async def edit_message(self, *args, **kwargs):
+        await self.rest.call("interaction.edit_message")
+
+
+class FakeFollowup:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def send(self, *args, **kwargs):
+        await self.rest.call("interaction.followup")
+
+
+class FakeInteraction:
+    def __init__(self, bot, rest, user_id):
+        self.bot = bot
+        self.user = FakeUser(rest, user_id)
+        self.response = FakeResponse(rest)
+        self.followup = FakeFollowup(rest)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.events = 0
+
+    def record(self, started):
+        self.latencies.append(time.perf_counter() - started)
+        self.events += 1
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def reaction_event(user_id):
+    data = {"user_id": user_id, "channel_id": CHANNEL_ID, "message_id": BOSS_MESSAGE_ID, "guild_id": GUILD_ID}
+    return disnake.RawReactionActionEvent(data, disnake.PartialEmoji(name="⚔️"), "REACTION_ADD")
+
+
+def patch_rest(bot, rest):
+    # REST-запросы, к которым обращается код ботов напрямую
+    async def fetch_user(user_id):
+        await rest.call("fetch_user")
+        return FakeUser(rest, user_id)
+
+    async def fetch_channel(channel_id):
+        await rest.call("fetch_channel")
+        return FakeChannel(rest)
+
+    bot.fetch_user = fetch_user
+    bot.fetch_channel = fetch_channel
+    bot._connection.user = SimpleNamespace(id=BOT_USER_ID)
+
+
+async def monitor_loop_lag(samples, interval=0.01):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(loop.time() - expected, 0.0))
+
+
+async def drive(rate, duration, handler, stats, pending):
+    # Равномерная подача событий с заданной частотой; обработчики идут параллельно, как в шлюзе
+    if rate <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for index in range(int(rate * duration)):
+        delay = start + index / rate - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        pending.add(loop.create_task(handler(stats)))
+
+
+async def run(args):
+    import main
+    from Giveaway import giveaway as giveaway_module
+
+    rng = random.Random(args.seed)
+    boss_rest = RestRecorder(args.rest_latency)
+    giveaway_rest = RestRecorder(args.rest_latency)
+
+    # Оба расширения работают в одном процессе, REST считается по функциям
+    bot = main.create_bot(["boss", "giveaway"])
+    patch_rest(bot, boss_rest)
+    boss_cog = bot.get_cog("BossCog")
+    boss = boss_cog.registry.create(CHANNEL_ID, BOSS_MESSAGE_ID)
+    boss.image_message = FakeMessage(boss_rest, BOSS_MESSAGE_ID)
+    boss.end_date = datetime.now() + timedelta(days=1)
+    # Босс не должен погибнуть за время прогона
+    boss.hp = (args.users + 1) * boss.DAMAGE
+    boss_cog.registry.add(boss)
+
+    gcog = bot.get_cog("GiveawayCog")
+    gcog.update_giveaways.cancel()
+    gcog.store = giveaway_module.GiveawayStore(os.path.join(os.getcwd(), "giveaways.db"))
+    giveaway = giveaway_module.Giveaway(1, "sim", (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y %H:%M"), 10)
+    giveaway.message_id = GIVEAWAY_MESSAGE_ID
+    giveaway.message = FakeMessage(giveaway_rest, GIVEAWAY_MESSAGE_ID)
+    gcog.giveaways.append(giveaway)
+    await gcog.store.save_giveaway(giveaway)
+    view = giveaway_module.GiveawayView(giveaway, gcog.store)
+
+    async def on_reaction(stats):
+        started = time.perf_counter()
+        await boss_cog.on_raw_reaction_add(reaction_event(rng.randrange(args.users) + 10))
+        stats.record(started)
+
+    async def on_click(stats):
+        started = time.perf_counter()
+        await view.join_button.callback(FakeInteraction(bot, giveaway_rest, rng.randrange(args.users) + 10))
+        stats.record(started)
+
+    async def refresh_giveaways():
+        while True:
+            await asyncio.sleep(gcog.REFRESH_INTERVAL / args.time_scale)
+            await gcog.update_giveaways()
+
+    lag_samples = []
+    reactions, clicks = Stats(), Stats()
+    pending = set()
+    background = [asyncio.create_task(monitor_loop_lag(lag_samples)), asyncio.create_task(refresh_giveaways())]
+    await asyncio.gather(drive(args.reactions_per_sec, args.duration, on_reaction, reactions, pending),
+                         drive(args.clicks_per_sec, args.duration, on_click, clicks, pending))
+    await asyncio.gather(*pending)
+    # Даём отложенным отрисовкам завершиться, чтобы учесть их REST-вызовы
+    await asyncio.sleep(boss.RENDER_INTERVAL)
+    await gcog.update_giveaways()
+    for task in background:
+        task.cancel()
+
+    lag_samples.sort()
+    report = {}
+    for name, stats, rest in (("reactions", reactions, boss_rest), ("clicks", clicks, giveaway_rest)):
+        report[name] = {
+            "events": stats.events,
+            "p50_ms": round(stats.percentile(0.5) * 1000, 3),
+            "p99_ms": round(stats.percentile(0.99) * 1000, 3),
+            "rest_calls": rest.total(),
+            "rest_per_event": round(rest.total() / stats.events, 3) if stats.events else 0.0,
+            "rest_breakdown": dict(rest.calls),
+        }
+    report["loop_lag"] = {
+        "p50_ms": round(lag_samples[len(lag_samples) // 2] * 1000, 3) if lag_samples else 0.0,
+        "p99_ms": round(lag_samples[int(len(lag_samples) * 0.99)] * 1000, 3) if lag_samples else 0.0,
+        "max_ms": round(lag_samples[-1] * 1000, 3) if lag_samples else 0.0,
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Офлайн-прогон обработчиков ботов без подключения к Discord")
+    parser.add_argument("--reactions-per-sec", type=float, default=200)
+    parser.add_argument("--clicks-per-sec", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=10, help="длительность прогона, секунды")
+    parser.add_argument("--users", type=int, default=5000, help="число различных пользователей")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="имитируемая задержка REST, секунды")
+    parser.add_argument("--time-scale", type=float, default=1, help="ускорение интервала обновления розыгрышей")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="куда записать отчёт в формате JSON")
+    args = parser.parse_args()
+
+    # Боты читают и пишут состояние относительно рабочего каталога
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        report = asyncio.run(run(args))
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
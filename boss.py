@@ -0,0 +1,420 @@
+import asyncio
+import base64
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from datetime import datetime
+import disnake
+from disnake.ext import commands
+
+from boss_store import BossJournal
+from metrics import metrics
+from participants import ParticipantSet, new_seed
+
+WIN_IMAGE_URL = "https://media.discordapp.net/attachments/1186689230630551552/1186689837932220527/win.png?ex=65942a08&is=6581b508&hm=e0da4a20d0c7fab6ba824047381736de4d7cc3036be2864009a2c7e33330af1f&=&format=webp&quality=lossless&width=1433&height=819"
+LOSE_IMAGE_URL = "https://media.discordapp.net/attachments/1186689230630551552/1186689837143687219/lose.png?ex=65942a08&is=6581b508&hm=db47559a9f69d7ff640de2016dab7d22d7b3cab6cb662bf4c89eee72cbf0fabf&=&format=webp&quality=lossless&width=1433&height=819"
+
+
+class BossRenderer:
+    # Планировщик перерисовки сообщения босса: копит изменения и редактирует
+    # сообщение не чаще одного раза в interval секунд, всегда с актуальным состоянием
+    def __init__(self, boss, interval, notifier):
+        self.boss = boss
+        self.interval = interval
+        self.notifier = notifier
+        self.dirty = False
+        self.finished = False
+        self._last_edit = 0.0
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    def mark_dirty(self):
+        if self.finished:
+            return
+        self.dirty = True
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while not self.finished:
+            await self._wakeup.wait()
+            delay = self._last_edit + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except disnake.HTTPException as e:
+                print(f"Error while rendering boss message: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            if not self.dirty or self.finished:
+                return
+            self.dirty = False
+            embed = build_boss_embed(self.boss)
+            await self._edit(embed)
+
+    async def finish(self, embed):
+        # Финальный кадр (победа/поражение) отправляется сразу, минуя интервал
+        self.finished = True
+        self.dirty = False
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        async with self._lock:
+            await self._edit(embed)
+
+    async def _edit(self, embed):
+        if self.boss.image_message:
+            await self.notifier.urgent(self.boss.image_message.edit(embed=embed))
+        self._last_edit = time.monotonic()
+
+
+class Boss:
+    MAX_HP = 1500
+    DAMAGE = 10
+    SNAPSHOT_EVERY = 500  # Как часто (в ударах) писать полный снимок состояния
+    RENDER_INTERVAL = 2  # Минимальный интервал между редактированиями сообщения босса, в секундах
+
+    def __init__(self, registry, channel_id, message_id, journal):
+        self.registry = registry
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.hp = self.MAX_HP
+        self.users_who_reacted = ParticipantSet()
+        self.image_message = None
+        self.end_date = None
+        self.event_ended = False  # Добавление флага завершения события
+        self.last_five_reactions = deque(maxlen=3)
+        self.renderer = BossRenderer(self, self.RENDER_INTERVAL, registry.bot.notifier)
+        self.journal = journal
+        self.hits_since_snapshot = 0
+
+    def damage(self, user_id):
+        if user_id not in self.users_who_reacted and datetime.now() < self.end_date:
+            self.apply_hit(user_id)
+            # В журнал уходит одна короткая запись, полный снимок пишется периодически
+            self.journal.append_hit(user_id)
+            self.hits_since_snapshot += 1
+            if self.hits_since_snapshot >= self.SNAPSHOT_EVERY:
+                save_boss_state(self)
+            return True
+        return False
+
+    def apply_hit(self, user_id):
+        self.hp -= self.DAMAGE
+        self.users_who_reacted.add(user_id)
+        self.last_five_reactions.append(user_id)  # Добавляем ID пользователя
+
+    def health_percentage(self):
+        return (self.hp / self.MAX_HP) * 100
+
+    async def win(self):
+        # Выбираем 5 случайных участников
+        seed = new_seed()
+        lucky_winners = self.users_who_reacted.draw(5, seed)
+        print(f"Boss {self.message_id}: winners drawn with seed {seed}")
+
+        # Создаем упоминания пользователей
+        winners_mentions = [f"<@{winner_id}>" for winner_id in lucky_winners]
+        winners_message = ", ".join(winners_mentions)
+
+        self.event_ended = True  # Отмечаем событие как завершенное
+        save_boss_state(self)
+        self.registry.remove(self)
+        await self.renderer.finish(build_win_embed(winners_message))
+        await self.registry.archive(self, "won", lucky_winners)
+
+    # Вызывается планировщиком в момент end_date
+    async def check_event_status(self):
+        if self.end_date is not None and datetime.now() >= self.end_date and not self.event_ended:
+            self.event_ended = True
+            if self.hp > 0:
+                # Обновляем сообщение, так как босс не был повержен
+                if self.image_message:
+                    await self.renderer.finish(build_lose_embed())
+            save_boss_state(self)
+            self.registry.remove(self)
+            await self.registry.archive(self, "won" if self.hp <= 0 else "lost")
+
+
+class BossRegistry:
+    # Все идущие битвы, по ID сообщения с боссом
+    LEGACY_CHANNEL_ID = 1186687603320303766  # Канал, в котором жил единственный босс до появления реестра
+    RESTORE_CONCURRENCY = 5  # Сколько сообщений запрашивается одновременно при восстановлении
+    REACTION = "⚔️"
+
+    def __init__(self, bot, directory="boss_states"):
+        self.bot = bot
+        self.directory = directory
+        self.bosses = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="boss-journal")
+
+    def __len__(self):
+        return len(self.bosses)
+
+    def get(self, message_id):
+        return self.bosses.get(message_id)
+
+    def create(self, channel_id, message_id):
+        os.makedirs(self.directory, exist_ok=True)
+        journal = BossJournal(os.path.join(self.directory, f"{message_id}.json"),
+                              os.path.join(self.directory, f"{message_id}.journal"),
+                              executor=self._executor)
+        return Boss(self, channel_id, message_id, journal)
+
+    def add(self, boss):
+        self.bosses[boss.message_id] = boss
+
+    def remove(self, boss):
+        if self.bosses.pop(boss.message_id, None) is not None:
+            self.bot.scheduler.cancel(("boss", boss.message_id))
+            self.bot.resolver.unpin_message(boss.message_id)
+            boss.journal.detach()
+
+    async def archive(self, boss, status, winners=()):
+        # Завершённая битва переносится в архив, её файлы из рабочего каталога удаляются
+        try:
+            await self.bot.archive.append("boss", boss.message_id, None, status, boss.users_who_reacted, winners,
+                                          channel_id=boss.channel_id, hp=boss.hp)
+        except OSError as e:
+            print(f"Boss {boss.message_id} not archived: {e}")
+            return
+        boss.journal.discard()
+
+    def load(self):
+        # Состояние каждого незавершённого босса: снимок плюс хвост журнала
+        self.migrate_legacy_state()
+        if not os.path.isdir(self.directory):
+            return
+        for file_name in os.listdir(self.directory):
+            name, ext = os.path.splitext(file_name)
+            if ext != ".json" or not name.isdigit() or int(name) in self.bosses:
+                continue
+            boss = self.create(None, int(name))
+            load_boss_state(boss)
+            if boss.event_ended or boss.end_date is None:
+                boss.journal.detach()
+                continue
+            self.add(boss)
+
+    def migrate_legacy_state(self, snapshot_path="boss_state.json", journal_path="boss_state.journal"):
+        # Перенос состояния из boss_state.json, где хранился единственный босс
+        if not os.path.exists(snapshot_path) and not os.path.exists(journal_path):
+            return
+        legacy = Boss(self, self.LEGACY_CHANNEL_ID, None, BossJournal(snapshot_path, journal_path, executor=self._executor))
+        load_boss_state(legacy)
+        legacy.journal.detach()
+        if legacy.message_id and not os.path.exists(os.path.join(self.directory, f"{legacy.message_id}.json")):
+            boss = self.create(legacy.channel_id or self.LEGACY_CHANNEL_ID, legacy.message_id)
+            boss.hp = legacy.hp
+            boss.users_who_reacted = legacy.users_who_reacted
+            boss.last_five_reactions = legacy.last_five_reactions
+            boss.end_date = legacy.end_date
+            boss.event_ended = legacy.event_ended
+            save_boss_state(boss)
+            if boss.event_ended or boss.end_date is None:
+                boss.journal.detach()
+            else:
+                self.add(boss)
+        # Старые файлы убираются после записи нового снимка (тот же поток записи). Файл
+        # нового босса отметкой о переносе служить не может: после архивации он удаляется
+        self._executor.submit(retire_legacy_files, snapshot_path, journal_path)
+
+    async def restore(self):
+        # Восстановление сообщений и сроков после перезапуска; повторный вызов ничего не меняет
+        semaphore = asyncio.Semaphore(self.RESTORE_CONCURRENCY)
+        await asyncio.gather(*[self.restore_message(boss, semaphore)
+                               for boss in list(self.bosses.values()) if boss.image_message is None])
+        # Удары, нанесённые пока бот был выключен, засчитываются до наступления сроков
+        await asyncio.gather(*[self.reconcile(boss, semaphore) for boss in list(self.bosses.values())])
+        for boss in self.bosses.values():
+            if ("boss", boss.message_id) not in self.bot.scheduler:
+                self.bot.scheduler.schedule(("boss", boss.message_id), boss.end_date, boss.check_event_status)
+
+    async def restore_message(self, boss, semaphore):
+        # Для редактирования достаточно частичного сообщения; запрос нужен, только если канала нет в кэше
+        channel = self.bot.get_channel(boss.channel_id)
+        if channel is not None:
+            boss.image_message = channel.get_partial_message(boss.message_id)
+        else:
+            async with semaphore:
+                try:
+                    boss.image_message = await self.bot.resolver.resolve_message(boss.channel_id, boss.message_id)
+                except disnake.NotFound:
+                    print(f"Message {boss.message_id} not found.")
+                    return
+                except disnake.HTTPException:
+                    print(f"Channel {boss.channel_id} not found.")
+                    return
+        self.bot.resolver.pin_message(boss.image_message)
+        print(f"Message restored: {boss.message_id}")
+
+    async def reconcile(self, boss, semaphore):
+        # Сверка реакций на сообщении с сохранёнными участниками. Реакции читаются
+        # постранично, в памяти только текущая страница; пропущенные удары
+        # применяются пачкой, затем один снимок и одна перерисовка.
+        # Время реакций неизвестно, поэтому после срока босса сверка не выполняется:
+        # живые удары после end_date тоже не засчитываются
+        if boss.end_date is None or datetime.now() >= boss.end_date:
+            return
+        async with semaphore:
+            try:
+                channel = await self.bot.resolver.resolve_channel(boss.channel_id)
+                message = await channel.fetch_message(boss.message_id)
+            except disnake.HTTPException as e:
+                print(f"Reactions of boss {boss.message_id} not reconciled: {e}")
+                return
+            reaction = disnake.utils.get(message.reactions, emoji=self.REACTION)
+            if reaction is None:
+                return
+
+            missed = 0
+            try:
+                async for user in reaction.users():
+                    # Босс мог погибнуть, а событие завершиться или выйти по сроку во время сверки
+                    if boss.event_ended or boss.hp <= 0 or datetime.now() >= boss.end_date:
+                        break
+                    if user.id == self.bot.user.id or user.id in boss.users_who_reacted:
+                        continue
+                    boss.apply_hit(user.id)
+                    missed += 1
+            except disnake.HTTPException as e:
+                print(f"Reactions of boss {boss.message_id} partially reconciled: {e}")
+
+        if not missed or boss.event_ended:
+            return
+        print(f"Boss {boss.message_id}: {missed} missed hits applied")
+        if boss.hp <= 0:
+            await boss.win()
+        else:
+            save_boss_state(boss)
+            boss.renderer.mark_dirty()
+
+def retire_legacy_files(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+
+# Функция для сохранения снимка состояния босса, запись выполняется вне цикла событий
+def save_boss_state(boss):
+    data = {
+        "hp": boss.hp,
+        "participants": base64.b64encode(boss.users_who_reacted.to_bytes()).decode(),
+        "end_date": boss.end_date.isoformat() if boss.end_date else None,
+        "event_ended": boss.event_ended,
+        "message_id": boss.message_id,
+        "channel_id": boss.channel_id
+    }
+    boss.journal.write_snapshot(data)
+    boss.hits_since_snapshot = 0
+
+# Функция для загрузки состояния босса: последний снимок плюс хвост журнала
+def load_boss_state(boss):
+    boss.journal.flush()  # Дожидаемся незавершённых записей перед чтением
+    data, tail = boss.journal.load()
+    if data is not None:
+        boss.hp = data.get("hp", Boss.MAX_HP)
+        if "participants" in data:
+            boss.users_who_reacted = ParticipantSet.from_bytes(base64.b64decode(data["participants"]))
+        else:
+            boss.users_who_reacted = ParticipantSet(data.get("users_who_reacted", []))
+        boss.end_date = datetime.fromisoformat(data["end_date"]) if data.get("end_date") else None
+        boss.event_ended = data.get("event_ended", False)
+        boss.message_id = data.get("message_id", boss.message_id)
+        boss.channel_id = data.get("channel_id", boss.channel_id)
+    for user_id in tail:
+        if user_id not in boss.users_who_reacted:
+            boss.apply_hit(user_id)
+    boss.hits_since_snapshot = len(tail)
+
+def get_boss_image_url(hp):
+    if hp >= 1000:
+        return "https://media.discordapp.net/attachments/1186689230630551552/1186689840402665532/1.png?ex=65942a09&is=6581b509&hm=c6e1fb916db168d25845dc1ce2726dba7215f3a76044c15f52f621f3f9d8ebfa&=&format=webp&quality=lossless&width=1433&height=819"
+    elif hp < 1000 and hp > 500:
+        return "https://media.discordapp.net/attachments/1186689230630551552/1186689839551225926/2.png?ex=65942a09&is=6581b509&hm=df4f6ab71363601344026a44e1b1c045c235e9bb708ac456f6d18fbce06b4738&=&format=webp&quality=lossless&width=1433&height=819"
+    elif hp < 500:
+        return "https://media.discordapp.net/attachments/1186689230630551552/1186689838766882906/3.png?ex=65942a09&is=6581b509&hm=d289e9fdce1797b72db81397235ef464a2b57bee21789ba99bc1cb38d531e94d&=&format=webp&quality=lossless&width=1433&height=819"
+
+def build_boss_embed(boss):
+    image_url = get_boss_image_url(boss.hp)
+
+    # Для упоминаний достаточно ID, запрашивать пользователей не нужно
+    who_attacked_mentions = [f"<@{attacked_id}>" for attacked_id in boss.last_five_reactions]
+    who_attacked_str = ", ".join(who_attacked_mentions)
+
+    embed = disnake.Embed(title=f"Нанесён удар по армии врага!", description=f"Их осталось {boss.hp} человек. \n Последние удары нанесли: {who_attacked_str}", color=0x00ff00)
+    embed.set_image(url=image_url)
+    return embed
+
+def build_win_embed(winners_message):
+    embed = disnake.Embed(title=f"Город был отбит!", description=f"\n Слава доблестным рыцарям \n Король наградил самых отважных: {winners_message}!", color=0x00ff00)
+    embed.set_image(url=WIN_IMAGE_URL)
+    return embed
+
+def build_lose_embed():
+    embed = disnake.Embed(title="Нападающие захватили город!", description="Рыцари не смогли защитить свой город, нападющие сожгли его до тла \n Армия короля была повержена", color=0xff0000)
+    embed.set_image(url=LOSE_IMAGE_URL)
+    return embed
+
+
+class BossCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.registry = BossRegistry(bot)
+        self.registry.load()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.registry.restore()
+
+    @commands.slash_command(name="start_event", description="Босс")
+    async def start_event(self, inter, end_date: str):
+        if inter.author.id != 564585498555711518:
+            await inter.response.send_message("У вас нет доступа к этой команде.", ephemeral=True)
+            return
+
+        end_date = datetime.strptime(end_date, '%d-%m-%Y %H:%M')
+
+        image_url = get_boss_image_url(Boss.MAX_HP)
+        embed = disnake.Embed(title="На город напала армия противника!", description=f"Нападающих: {Boss.MAX_HP} человек \n Нужно уничтожить всех и отбить город!", color=0x00ff00)
+        embed.set_image(url=image_url)
+        image_message = await inter.channel.send(embed=embed)
+
+        # Каждое событие получает собственного босса со своим HP, сроком и участниками
+        boss = self.registry.create(inter.channel.id, image_message.id)
+        boss.image_message = image_message
+        boss.end_date = end_date
+        self.registry.add(boss)
+        save_boss_state(boss)
+        self.bot.resolver.pin_message(image_message)
+        self.bot.scheduler.schedule(("boss", boss.message_id), boss.end_date, boss.check_event_status)
+
+        await image_message.add_reaction(BossRegistry.REACTION)
+        await inter.response.send_message(f"Конкурс запущен.", ephemeral=True)
+
+    @commands.Cog.listener()
+    @metrics.instrument("on_raw_reaction_add")
+    async def on_raw_reaction_add(self, payload: disnake.RawReactionActionEvent):
+        # Проверяем, что реакция была добавлена к сообщению одного из боссов
+        boss = self.registry.get(payload.message_id)
+        if boss is None or payload.user_id == self.bot.user.id:
+            return
+
+        if payload.emoji.name == BossRegistry.REACTION:
+            if boss.damage(payload.user_id):
+                if boss.hp <= 0:
+                    await boss.win()
+                else:
+                    # Сообщение перерисуется планировщиком с последним состоянием
+                    boss.renderer.mark_dirty()
+            else:
+                # Напоминание уходит через очередь ЛС: не чаще раза за окно и после сообщений босса
+                self.bot.notifier.send_dm(payload.user_id, f"<@{payload.user_id}>, вы уже атаковали врага!", payload.member)
+
+
+def setup(bot):
+    bot.add_cog(BossCog(bot))
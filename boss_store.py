@@ -0,0 +1,103 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BossJournal:
+    # Хранилище состояния босса: каждый удар дописывается одной строкой в журнал,
+    # периодически пишется атомарный снимок, после которого журнал обрезается.
+    # Запись на диск выполняется в отдельном потоке, порядок операций сохраняется.
+    def __init__(self, snapshot_path="boss_state.json", journal_path="boss_state.journal", executor=None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.seq = 0
+        # Несколько журналов могут делить один поток записи
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="boss-journal")
+        self._journal_file = None
+
+    def append_hit(self, user_id):
+        self.seq += 1
+        self._executor.submit(self._append, f"{self.seq} {user_id}\n")
+
+    def write_snapshot(self, data):
+        data = dict(data, seq=self.seq)
+        self._executor.submit(self._write_snapshot, data)
+
+    def load(self):
+        # Возвращает последний снимок и удары из журнала, которых в нём ещё нет
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                snapshot = json.load(file)
+        snapshot_seq = snapshot.get("seq", 0) if snapshot else 0
+        self.seq = snapshot_seq
+        tail = []
+        if os.path.exists(self.journal_path):
+            valid_size = 0
+            with open(self.journal_path, "rb") as file:
+                for line in file:
+                    parts = line.split()
+                    # Последняя строка могла остаться недописанной при падении
+                    if len(parts) != 2 or not line.endswith(b"\n"):
+                        break
+                    seq, user_id = int(parts[0]), int(parts[1])
+                    if seq > snapshot_seq:
+                        tail.append(user_id)
+                        self.seq = seq
+                    valid_size += len(line)
+            # Отрезаем повреждённый хвост, чтобы новые записи не склеились с ним
+            if valid_size != os.path.getsize(self.journal_path):
+                os.truncate(self.journal_path, valid_size)
+        return snapshot, tail
+
+    def flush(self):
+        self._executor.submit(self._sync).result()
+
+    def close(self):
+        self.flush()
+        self._executor.submit(self._close).result()
+        if self._owns_executor:
+            self._executor.shutdown()
+
+    def detach(self):
+        # Закрывает файл после уже поставленных в очередь записей, не дожидаясь их
+        self._executor.submit(self._close)
+
+    def discard(self):
+        # Удаляет файлы после уже поставленных в очередь записей: событие перенесено в архив
+        self._executor.submit(self._discard)
+
+    def _append(self, line):
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, "a")
+        self._journal_file.write(line)
+        self._journal_file.flush()
+
+    def _write_snapshot(self, data):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Все строки журнала с номером не больше data["seq"] уже вошли в снимок
+        self._close()
+        open(self.journal_path, "w").close()
+
+    def _sync(self):
+        if self._journal_file is not None:
+            self._journal_file.flush()
+
+    def _close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _discard(self):
+        self._close()
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,225 @@
+import asyncio
+import functools
+import logging
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    # Гистограмма в стиле Prometheus: счётчики по верхним границам корзин, сумма и количество
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, fraction):
+        # Оценка по верхней границе корзины
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    # Реестр метрик процесса: счётчики и гистограммы с метками
+    def __init__(self):
+        self._metrics = {}
+        self._help = {}
+        self._server = None
+        self._monitor = None
+
+    def _get(self, kind, name, labels, help_text):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = kind()
+            self._help.setdefault(name, (help_text, "counter" if kind is Counter else "histogram"))
+        return metric
+
+    def counter(self, name, help_text="", **labels):
+        return self._get(Counter, name, labels, help_text)
+
+    def histogram(self, name, help_text="", **labels):
+        return self._get(Histogram, name, labels, help_text)
+
+    def instrument(self, name):
+        # Декоратор для обработчиков событий и кнопок: время выполнения и число ошибок
+        def decorator(func):
+            latency = self.histogram("handler_latency_seconds", "Время выполнения обработчика", handler=name)
+            errors = self.counter("handler_errors_total", "Исключения в обработчике", handler=name)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def instrument_loop(self, name, interval):
+        # Декоратор для тела tasks.loop: длительность итерации и опоздание относительно интервала
+        def decorator(func):
+            duration = self.histogram("loop_duration_seconds", "Длительность итерации цикла", loop=name)
+            lag = self.histogram("loop_lag_seconds", "Опоздание итерации цикла", loop=name)
+            last_start = None
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                nonlocal last_start
+                started = time.perf_counter()
+                if last_start is not None:
+                    lag.observe(max(started - last_start - interval, 0.0))
+                last_start = started
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    duration.observe(time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def attach(self, bot):
+        # Время слэш-команд, REST-вызовы и ограничения частоты для бота
+        started = {}
+        commands = {}
+
+        async def before_slash_command(inter):
+            started[inter.id] = time.perf_counter()
+
+        async def after_slash_command(inter):
+            start = started.pop(inter.id, None)
+            if start is not None:
+                name = inter.application_command.qualified_name
+                histogram = commands.get(name)
+                if histogram is None:
+                    histogram = commands[name] = self.histogram("slash_command_latency_seconds", "Время выполнения слэш-команды", command=name)
+                histogram.observe(time.perf_counter() - start)
+
+        bot.before_slash_command_invoke(before_slash_command)
+        bot.after_slash_command_invoke(after_slash_command)
+
+        request = bot.http.request
+
+        @functools.wraps(request)
+        async def counted_request(route, **kwargs):
+            self.counter("rest_requests_total", "REST-запросы к Discord", method=route.method, path=route.path).inc()
+            return await request(route, **kwargs)
+
+        bot.http.request = counted_request
+        logging.getLogger("disnake.http").addHandler(RateLimitHandler(self))
+
+    async def monitor_event_loop(self, interval=0.5):
+        lag = self.histogram("event_loop_lag_seconds", "Задержка цикла событий")
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag.observe(max(loop.time() - expected, 0.0))
+
+    def render(self):
+        # Текстовый формат экспозиции Prometheus
+        lines = []
+        by_name = {}
+        for (name, labels), metric in self._metrics.items():
+            by_name.setdefault(name, []).append((labels, metric))
+        for name, series in sorted(by_name.items()):
+            help_text, kind = self._help[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                if isinstance(metric, Counter):
+                    lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+                    continue
+                seen = 0
+                for bound, count in zip(metric.buckets, metric.counts):
+                    seen += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(float(bound))),))} {seen}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {metric.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {metric.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        # Краткая сводка для команды администратора
+        lines = []
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            label = ",".join(f"{key}={value}" for key, value in labels)
+            if isinstance(metric, Counter):
+                lines.append(f"{name}{{{label}}} = {metric.value}")
+            else:
+                lines.append(f"{name}{{{label}}} n={metric.count} p50<={metric.quantile(0.5)}s p99<={metric.quantile(0.99)}s")
+        return "\n".join(lines)
+
+    async def start(self, host="127.0.0.1", port=9100):
+        # Повторный вызов (например, при переподключении) ничего не делает
+        if self._monitor is not None:
+            return
+        self._monitor = asyncio.get_running_loop().create_task(self.monitor_event_loop())
+        try:
+            self._server = await self.serve(host, port)
+        except OSError as e:
+            print(f"Metrics endpoint is not available: {e}")
+
+    async def serve(self, host="127.0.0.1", port=9100):
+        # Локальная страница /metrics для сборщика Prometheus
+        async def handle(reader, writer):
+            try:
+                await reader.readline()
+                body = self.render().encode()
+                writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                             + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+
+class RateLimitHandler(logging.Handler):
+    # disnake обрабатывает 429 сам и только пишет предупреждение в лог
+    def __init__(self, metrics):
+        super().__init__(logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record):
+        # На каждый 429 disnake пишет "We are being rate limited", а на глобальный
+        # ещё и "Global rate limit has been hit": общий счётчик растёт только от первого
+        message = record.getMessage()
+        if message.startswith("We are being rate limited"):
+            self.metrics.counter("rest_rate_limited_total", "Ответы 429 от Discord").inc()
+        elif message.startswith("Global rate limit has been hit"):
+            self.metrics.counter("rest_global_rate_limited_total", "Ответы 429 от Discord с глобальным ограничением").inc()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+metrics = Metrics()
@@ -0,0 +1,78 @@
+import asyncio
+import itertools
+
+import disnake
+
+from metrics import metrics
+from resolver import TTLCache
+
+
+class Notifier:
+    # Очередь исходящих личных сообщений. Повторы одному пользователю в пределах
+    # окна подавляются, каналы ЛС кэшируются, а ЛС уходят только когда нет
+    # срочных операций (сообщение босса, объявления о победе и поражении)
+    PRIORITY_URGENT = 0
+    PRIORITY_COURTESY = 1
+
+    def __init__(self, resolver, dedupe_window=300, max_queue=1000, cache_size=4096):
+        self.resolver = resolver
+        self._queue = asyncio.PriorityQueue(max_queue)
+        self._counter = itertools.count()
+        self._recent = TTLCache(cache_size, dedupe_window)
+        self._dm_channels = TTLCache(cache_size, 3600)
+        self._urgent = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = None
+        self.sent = metrics.counter("notifications_total", "Личные сообщения", result="sent")
+        self.suppressed = metrics.counter("notifications_total", "Личные сообщения", result="suppressed")
+        self.dropped = metrics.counter("notifications_total", "Личные сообщения", result="dropped")
+        self.failed = metrics.counter("notifications_total", "Личные сообщения", result="failed")
+
+    async def urgent(self, awaitable):
+        # Срочная операция выполняется сразу, очередь ЛС ждёт её завершения
+        self._urgent += 1
+        self._idle.clear()
+        try:
+            return await awaitable
+        finally:
+            self._urgent -= 1
+            if not self._urgent:
+                self._idle.set()
+
+    def send_dm(self, user_id, content, user=None, priority=PRIORITY_COURTESY):
+        if self._recent.get(user_id) is not None:
+            self.suppressed.inc()
+            return False
+        try:
+            self._queue.put_nowait((priority, next(self._counter), user_id, content, user))
+        except asyncio.QueueFull:
+            self.dropped.inc()
+            return False
+        self._recent.set(user_id, True)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def _run(self):
+        while True:
+            priority, _, user_id, content, user = await self._queue.get()
+            await self._idle.wait()
+            try:
+                channel = await self._dm_channel(user_id, user)
+                await channel.send(content)
+                self.sent.inc()
+            except disnake.HTTPException:
+                # Закрытые ЛС и прочие ошибки доставки не критичны
+                self.failed.inc()
+            finally:
+                self._queue.task_done()
+
+    async def _dm_channel(self, user_id, user):
+        channel = self._dm_channels.get(user_id)
+        if channel is None:
+            if user is None:
+                user = await self.resolver.resolve_user(user_id)
+            channel = user.dm_channel or await user.create_dm()
+            self._dm_channels.set(user_id, channel)
+        return channel
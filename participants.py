@@ -0,0 +1,114 @@
+import random
+import secrets
+import sys
+from array import array
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def new_seed():
+    # Сид розыгрыша; вместе с сериализованным набором участников позволяет повторить выбор
+    return secrets.randbits(64)
+
+
+class ParticipantSet:
+    # Набор ID участников (snowflake, uint64) в упакованных массивах:
+    # плотный массив в порядке добавления для выбора по индексу и
+    # хэш-таблица с открытой адресацией для проверки членства. 0 - пустая ячейка
+    def __init__(self, user_ids=()):
+        self._ids = array("Q")
+        self._set_bits(3)
+        self.update(user_ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __contains__(self, user_id):
+        # Проба развёрнута прямо здесь: это самый частый вызов в обработчиках
+        slots = self._slots
+        index = ((user_id * _HASH_MULTIPLIER) & _MASK64) >> self._shift
+        slot = slots[index]
+        while slot:
+            if slot == user_id:
+                return True
+            index = (index + 1) & self._mask
+            slot = slots[index]
+        return False
+
+    def _find(self, user_id):
+        mask = self._mask
+        index = ((user_id * _HASH_MULTIPLIER) & _MASK64) >> self._shift
+        slots = self._slots
+        while slots[index] and slots[index] != user_id:
+            index = (index + 1) & mask
+        return index
+
+    def add(self, user_id):
+        index = self._find(user_id)
+        if self._slots[index] == user_id:
+            return False
+        self._slots[index] = user_id
+        self._ids.append(user_id)
+        if len(self._ids) * 4 >= len(self._slots) * 3:
+            self._rehash(self._bits + 1)
+        return True
+
+    def update(self, user_ids):
+        for user_id in user_ids:
+            self.add(user_id)
+
+    def _set_bits(self, bits):
+        self._bits = bits
+        self._shift = 64 - bits
+        self._mask = (1 << bits) - 1
+        self._slots = array("Q", bytes(8 << bits))
+
+    def _rehash(self, bits):
+        self._set_bits(bits)
+        for user_id in self._ids:
+            self._slots[self._find(user_id)] = user_id
+
+    def draw(self, k, seed, weights=None):
+        # Выбор k различных участников. Без весов - O(k), с весами (по одному на
+        # участника в порядке добавления) - O(n) на построение таблицы и O(k log n) на выбор
+        rng = random.Random(seed)
+        k = min(k, len(self._ids))
+        if weights is None:
+            return [self._ids[index] for index in rng.sample(range(len(self._ids)), k)]
+        weights = list(weights)
+        cum_weights = []
+        total = 0
+        for weight in weights:
+            total += weight
+            cum_weights.append(total)
+        k = min(k, sum(1 for weight in weights if weight > 0))
+        population = range(len(self._ids))
+        chosen = {}
+        while len(chosen) < k:
+            index = rng.choices(population, cum_weights=cum_weights)[0]
+            chosen.setdefault(index, None)
+        return [self._ids[index] for index in chosen]
+
+    def to_bytes(self):
+        ids = array("Q", self._ids)
+        if sys.byteorder != "little":
+            ids.byteswap()
+        return ids.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        ids = array("Q")
+        ids.frombytes(data)
+        if sys.byteorder != "little":
+            ids.byteswap()
+        participants = cls()
+        participants._ids = ids
+        bits = 3
+        while len(ids) * 4 >= (3 << bits):
+            bits += 1
+        participants._rehash(bits)
+        return participants
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    # Ограниченный LRU-кэш с временем жизни записей
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class Resolver:
+    # Получение каналов, сообщений и пользователей: сначала кэш шлюза и
+    # закреплённые объекты, затем собственный TTL-кэш и только потом REST
+    def __init__(self, bot, maxsize=1024, ttl=300):
+        self.bot = bot
+        self.cache = TTLCache(maxsize, ttl)
+        self.pinned_messages = {}
+        self.hits = 0
+        self.misses = 0
+
+    def pin_message(self, message):
+        if message is not None:
+            self.pinned_messages[message.id] = message
+
+    def unpin_message(self, message_id):
+        self.pinned_messages.pop(message_id, None)
+
+    async def resolve_channel(self, channel_id):
+        channel = self.bot.get_channel(channel_id) or self.cache.get(("channel", channel_id))
+        if channel is not None:
+            self.hits += 1
+            return channel
+        self.misses += 1
+        channel = await self.bot.fetch_channel(channel_id)
+        self.cache.set(("channel", channel_id), channel)
+        return channel
+
+    async def resolve_message(self, channel_id, message_id):
+        message = (self.pinned_messages.get(message_id)
+                   or self.bot.get_message(message_id)
+                   or self.cache.get(("message", message_id)))
+        if message is not None:
+            self.hits += 1
+            return message
+        channel = await self.resolve_channel(channel_id)
+        self.misses += 1
+        message = await channel.fetch_message(message_id)
+        self.cache.set(("message", message_id), message)
+        return message
+
+    async def resolve_user(self, user_id):
+        user = self.bot.get_user(user_id) or self.cache.get(("user", user_id))
+        if user is not None:
+            self.hits += 1
+            return user
+        self.misses += 1
+        user = await self.bot.fetch_user(user_id)
+        self.cache.set(("user", user_id), user)
+        return user
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self.cache)}
@@ -0,0 +1,82 @@
+import asyncio
+import heapq
+import itertools
+from datetime import datetime
+
+from metrics import metrics
+
+
+class DeadlineScheduler:
+    # Общий планировщик окончания событий: min-куча сроков, задача спит ровно
+    # до ближайшего срока и просыпается раньше при добавлении или отмене события.
+    # Часы передаются снаружи, чтобы их можно было подменить
+    def __init__(self, clock=datetime.now):
+        self.clock = clock
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.lateness = metrics.histogram("scheduler_lateness_seconds", "Опоздание срабатывания относительно срока")
+
+    def schedule(self, key, when, callback):
+        # Повторное планирование по тому же ключу заменяет прежний срок
+        self.cancel(key)
+        entry = [when, next(self._counter), key, callback]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._wakeup.set()
+
+    def cancel(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[-1] = None  # Запись остаётся в куче и пропускается при извлечении
+            self._wakeup.set()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def next_deadline(self):
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self):
+        now = self.clock()
+        due = []
+        while self.next_deadline() is not None and self._heap[0][0] <= now:
+            when, _, key, callback = heapq.heappop(self._heap)
+            del self._entries[key]
+            self.lateness.observe((now - when).total_seconds())
+            due.append((key, callback))
+        return due
+
+    async def run_due(self):
+        for key, callback in self.pop_due():
+            try:
+                await callback()
+            except Exception as e:
+                print(f"Error while ending event {key}: {e}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.run_due()
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max((deadline - self.clock()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,44 @@
+import asyncio
+import gzip
+import json
+
+from archive import EventArchive
+from participants import ParticipantSet
+
+
+def append(archive, event_id, user_ids):
+    asyncio.run(archive.append("giveaway", event_id, f"event {event_id}", "finished", ParticipantSet(user_ids), [user_ids[0]]))
+
+
+def test_records_round_trip(tmp_path):
+    archive = EventArchive(str(tmp_path / "archive.jsonl.gz"))
+    for event_id in range(1, 4):
+        append(archive, event_id, [7, 100 + event_id])
+
+    records, total = asyncio.run(archive.history(1, 2))
+    assert total == 3
+    assert [record["id"] for record in records] == [3, 2]
+    assert "entries" not in records[0]
+    assert asyncio.run(archive.participation(7)) == {"events": 3, "wins": 3, "giveaway": 3, "boss": 0}
+
+
+def test_torn_tail_is_cut_before_next_append(tmp_path):
+    path = tmp_path / "archive.jsonl.gz"
+    archive = EventArchive(str(path))
+    for event_id in range(1, 26):
+        append(archive, event_id, [7, 100 + event_id])
+
+    # Недописанный блок, как после падения посреди записи
+    member = gzip.compress(json.dumps({"kind": "boss", "id": 0}).encode() + b"\n")
+    with open(path, "ab") as file:
+        file.write(member[:len(member) // 2])
+
+    # Новый процесс: первая запись обрезает повреждённый хвост
+    archive = EventArchive(str(path))
+    asyncio.run(archive.append("boss", 99, None, "won", ParticipantSet([7, 8]), [8]))
+
+    records, total = asyncio.run(archive.history(1, 1))
+    assert total == 26
+    assert records[0]["id"] == 99
+    assert asyncio.run(archive.participation(7))["events"] == 26
+    assert asyncio.run(archive.participation(8)) == {"events": 1, "wins": 1, "giveaway": 0, "boss": 1}
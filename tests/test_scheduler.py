@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from scheduler import DeadlineScheduler
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def recorder(fired, name):
+    async def callback():
+        fired.append(name)
+    return callback
+
+
+def at(seconds):
+    return START + timedelta(seconds=seconds)
+
+
+def test_due_events_fire_in_deadline_order():
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(clock=clock)
+    fired = []
+    scheduler.schedule("c", at(30), recorder(fired, "c"))
+    scheduler.schedule("a", at(10), recorder(fired, "a"))
+    scheduler.schedule("b", at(20), recorder(fired, "b"))
+
+    assert scheduler.next_deadline() == at(10)
+    assert scheduler.pop_due() == []
+
+    clock.advance(25)
+    asyncio.run(scheduler.run_due())
+    assert fired == ["a", "b"]
+    assert "c" in scheduler and len(scheduler) == 1
+
+    clock.advance(10)
+    asyncio.run(scheduler.run_due())
+    assert fired == ["a", "b", "c"]
+    assert len(scheduler) == 0
+    assert scheduler.next_deadline() is None
+
+
+def test_reschedule_replaces_previous_deadline():
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(clock=clock)
+    fired = []
+    scheduler.schedule("event", at(10), recorder(fired, "old"))
+    scheduler.schedule("event", at(60), recorder(fired, "new"))
+
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == at(60)
+
+    clock.advance(30)
+    asyncio.run(scheduler.run_due())
+    assert fired == []
+
+    clock.advance(30)
+    asyncio.run(scheduler.run_due())
+    assert fired == ["new"]
+
+
+def test_cancel_removes_event():
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(clock=clock)
+    fired = []
+    scheduler.schedule("kept", at(10), recorder(fired, "kept"))
+    scheduler.schedule("cancelled", at(5), recorder(fired, "cancelled"))
+    scheduler.cancel("cancelled")
+    scheduler.cancel("missing")
+
+    assert "cancelled" not in scheduler
+    assert scheduler.next_deadline() == at(10)
+
+    clock.advance(60)
+    asyncio.run(scheduler.run_due())
+    assert fired == ["kept"]
+
+
+def test_failing_callback_does_not_block_others():
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(clock=clock)
+    fired = []
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    scheduler.schedule("broken", at(1), broken)
+    scheduler.schedule("ok", at(2), recorder(fired, "ok"))
+    clock.advance(5)
+    asyncio.run(scheduler.run_due())
+    assert fired == ["ok"]
+
+
+def test_schedule_wakes_sleeping_loop():
+    async def scenario():
+        clock = FakeClock()
+        scheduler = DeadlineScheduler(clock=clock)
+        fired = asyncio.Event()
+
+        async def callback():
+            fired.set()
+
+        # Цикл засыпает до срока через час по подменённым часам
+        scheduler.schedule("late", at(3600), callback)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert not fired.is_set()
+
+        # Новое событие со сроком, который уже наступил, будит цикл без ожидания таймаута
+        scheduler.schedule("now", at(0), callback)
+        try:
+            await asyncio.wait_for(fired.wait(), 1)
+        finally:
+            scheduler.stop()
+        assert "now" not in scheduler
+        assert "late" in scheduler
+
+    asyncio.run(scenario())